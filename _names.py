@@ -0,0 +1,10 @@
+import re
+
+# Acaia devices advertise with names like "PROCHBT001", "PR BT CB0E", or
+# names containing ACAIA, PYXIS, LUNAR or PEARL
+ACAIA_NAME_RE = re.compile(r"PROCH|PR BT|ACAIA|PYXIS|LUNAR|PEARL", re.IGNORECASE)
+
+
+def is_acaia_name(name):
+    """Return True if a Bluetooth device name looks like an Acaia scale."""
+    return ACAIA_NAME_RE.search(name) is not None
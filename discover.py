@@ -1,35 +1,72 @@
 import asyncio
+import contextlib
 
 from bleak import BleakScanner
 
+from _names import is_acaia_name
+
+
+async def scan_for_devices(timeout=10.0, settle=0.5):
+    """Scan for Bluetooth LE devices, stopping shortly after an Acaia scale is seen.
+
+    Args:
+        timeout: Maximum time to scan if no Acaia scale shows up
+        settle: Time to keep scanning after the first Acaia scale, to pick up others nearby
+
+    Returns:
+        List of (device, name) pairs for every device seen during the scan, where
+        name comes from the device or its advertisement data ("Unknown" if neither has one)
+    """
+    devices = {}
+    found = asyncio.Event()
+
+    def on_detection(device, advertisement_data):
+        # Keep a name seen in an earlier advertisement if this one has none
+        _, known_name = devices.get(device.address, (None, None))
+        name = device.name or advertisement_data.local_name or known_name
+        devices[device.address] = (device, name)
+        if name and is_acaia_name(name):
+            found.set()
+
+    scanner = BleakScanner(detection_callback=on_detection)
+    await scanner.start()
+    try:
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(found.wait(), timeout=timeout)
+        if found.is_set():
+            await asyncio.sleep(settle)
+    finally:
+        await scanner.stop()
+
+    return [(device, name or "Unknown") for device, name in devices.values()]
+
 
 async def discover_acaia_scales():
     """Discover Acaia scales via Bluetooth LE."""
     print("Scanning for Bluetooth devices...")
-    devices = await BleakScanner.discover(timeout=10.0)
+    devices = await scan_for_devices()
 
     print(f"\nFound {len(devices)} devices:\n")
 
     acaia_devices = []
-    for device in devices:
+    for device, name in devices:
         # Acaia devices typically have names like "PROCHBT", "ACAIA", or "PYXIS"
-        name = device.name or "Unknown"
         print(f"  {device.address} - {name}")
 
-        if any(keyword in name.upper() for keyword in ["PROCH", "PR BT", "ACAIA", "PYXIS", "LUNAR", "PEARL"]):
-            acaia_devices.append(device)
+        if is_acaia_name(name):
+            acaia_devices.append((device, name))
             print("    ^^^ Possible Acaia device!")
 
     if acaia_devices:
         print(f"\n\nFound {len(acaia_devices)} potential Acaia device(s):")
-        for device in acaia_devices:
+        for device, name in acaia_devices:
             print(f"  MAC: {device.address}")
-            print(f"  Name: {device.name}")
+            print(f"  Name: {name}")
             print()
     else:
         print("\nNo Acaia devices found. Make sure your scale is on and in pairing mode.")
 
-    return acaia_devices
+    return [device for device, _ in acaia_devices]
 
 if __name__ == "__main__":
     asyncio.run(discover_acaia_scales())
@@ -2,16 +2,14 @@ import argparse
 import asyncio
 import base64
 import contextlib
-import csv
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
 from email.mime.text import MIMEText
+import functools
 import os
 from pathlib import Path
 import signal
 import time
 
-from bleak import BleakScanner
-
 # Gmail API imports - will be conditionally used if credentials are available
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -20,23 +18,38 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from pyacaia import AcaiaScale
 
+from _names import is_acaia_name
+from discover import scan_for_devices
 from simulator import create_mock_scale
 
+# Seconds between CSV flushes while a bird is present; landing and leaving
+# events are always flushed immediately
+CSV_FLUSH_INTERVAL = 5.0
 
-def get_state_file_path():
-    """Get the path to the state file using XDG_STATE_HOME."""
+# Upper bound in seconds on the battery check interval when backing off
+BATTERY_CHECK_MAX_INTERVAL = 1800
+
+
+@functools.lru_cache(maxsize=1)
+def get_state_dir():
+    """Get the state directory using XDG_STATE_HOME."""
     xdg_state_home = os.getenv("XDG_STATE_HOME")
     if xdg_state_home:
         state_dir = Path(xdg_state_home) / "acaia-scale"
     else:
         state_dir = Path.home() / ".local" / "state" / "acaia-scale"
 
-    state_dir.mkdir(parents=True, exist_ok=True)
-    return state_dir / "mac_address.txt"
+    return state_dir
+
+
+def get_state_file_path():
+    """Get the path to the state file."""
+    return get_state_dir() / "mac_address.txt"
 
 
 def load_mac_address():
     """Load MAC address from state file."""
+    # A missing state directory just means there is no saved address yet
     state_file = get_state_file_path()
     if state_file.exists():
         return state_file.read_text().strip()
@@ -46,6 +59,7 @@ def load_mac_address():
 def save_mac_address(mac):
     """Save MAC address to state file."""
     state_file = get_state_file_path()
+    state_file.parent.mkdir(parents=True, exist_ok=True)
     state_file.write_text(mac)
 
 
@@ -91,6 +105,31 @@ def get_gmail_credentials():
     return creds
 
 
+# Gmail service reused across alerts so each send is a single API call
+_SERVICE_CACHE = {'service': None, 'creds': None}
+
+
+def get_gmail_service():
+    """Get a Gmail API service, reusing the cached one and refreshing its token before it expires."""
+    creds = _SERVICE_CACHE['creds']
+    if creds:
+        # google-auth stores expiry as a naive UTC datetime
+        now = datetime.now(UTC).replace(tzinfo=None)
+        if creds.refresh_token and creds.expiry and creds.expiry <= now + timedelta(minutes=5):
+            # The cached service holds this same creds object, so refreshing in place updates it
+            creds.refresh(Request())
+        if creds.valid:
+            return _SERVICE_CACHE['service']
+
+    creds = get_gmail_credentials()
+    if not creds:
+        return None
+
+    _SERVICE_CACHE['creds'] = creds
+    _SERVICE_CACHE['service'] = build('gmail', 'v1', credentials=creds, cache_discovery=False)
+    return _SERVICE_CACHE['service']
+
+
 def send_battery_alert(battery_level, threshold, recipient_email, mac_address=None):
     """Send battery alert email via Gmail API.
 
@@ -104,15 +143,12 @@ def send_battery_alert(battery_level, threshold, recipient_email, mac_address=No
         True if email sent successfully, False otherwise
     """
     try:
-        creds = get_gmail_credentials()
-        if not creds:
+        service = get_gmail_service()
+        if not service:
             print("Warning: Gmail credentials not found. Skipping email alert.")
             print("To enable email alerts, set up credentials.json (see documentation)")
             return False
 
-        # Build Gmail service
-        service = build('gmail', 'v1', credentials=creds)
-
         # Create email message
         subject = "Low Battery Alert: Acaia Scale"
         body = f"""Battery Alert for Acaia Scale
@@ -153,13 +189,12 @@ Please charge or replace the battery soon to avoid monitoring interruption.
 async def discover_acaia_scale():
     """Discover Acaia scale via Bluetooth LE."""
     print("Scanning for Acaia scales...")
-    devices = await BleakScanner.discover(timeout=10.0)
+    devices = await scan_for_devices()
 
     acaia_devices = []
-    for device in devices:
-        name = device.name or "Unknown"
-        if any(keyword in name.upper() for keyword in ["PROCH", "PR BT", "ACAIA", "PYXIS", "LUNAR", "PEARL"]):
-            acaia_devices.append(device)
+    for device, name in devices:
+        if is_acaia_name(name):
+            acaia_devices.append((device, name))
             print(f"Found Acaia device: {device.address} - {name}")
 
     if not acaia_devices:
@@ -167,16 +202,16 @@ async def discover_acaia_scale():
 
     if len(acaia_devices) > 1:
         print("\nMultiple Acaia devices found:")
-        for i, device in enumerate(acaia_devices, 1):
-            print(f"  {i}. {device.address} - {device.name}")
+        for i, (device, name) in enumerate(acaia_devices, 1):
+            print(f"  {i}. {device.address} - {name}")
         choice = int(input("Select device number: ")) - 1
-        return acaia_devices[choice].address
+        return acaia_devices[choice][0].address
 
-    return acaia_devices[0].address
+    return acaia_devices[0][0].address
 
 
-async def connect_scale(use_simulator, scenario, mac_address):
-    """Connect to scale (simulator or real hardware)."""
+def _connect_scale_sync(use_simulator, scenario, mac_address):
+    """Create and connect a scale, blocking until the connection is up."""
     if use_simulator:
         scale = create_mock_scale(scenario=scenario)
         scale.connect()
@@ -187,64 +222,130 @@ async def connect_scale(use_simulator, scenario, mac_address):
         return scale
 
 
+async def connect_scale(use_simulator, scenario, mac_address):
+    """Connect to scale (simulator or real hardware)."""
+    # pyacaia calls block, so keep them off the event loop
+    return await asyncio.to_thread(_connect_scale_sync, use_simulator, scenario, mac_address)
+
+
+async def sleep_or_shutdown(delay, shutdown_event):
+    """Sleep for delay seconds, waking early if shutdown_event is set.
+
+    Returns:
+        True if shutdown_event is set, False otherwise
+    """
+    with contextlib.suppress(TimeoutError):
+        await asyncio.wait_for(shutdown_event.wait(), timeout=delay)
+    return shutdown_event.is_set()
+
+
 async def monitor_scale(scale, log_file, shutdown_event, use_simulator=False, scenario="random", mac_address=None, interval=1.0, min_bird_weight=25, max_bird_weight=60, battery_threshold=20.0, battery_check_interval=300, alert_email=None, disable_battery_alerts=False):
-    """Monitor scale continuously and log bird weights."""
-    bird_start_time = None
-    last_battery_check = 0
+    """Monitor scale continuously and log bird weights.
+
+    Everything here runs on the event loop: use asyncio.sleep rather than
+    time.sleep, and asyncio.to_thread for blocking scale calls.
+    """
+    bird_start_mono = None
+    battery_level = None
     battery_alert_sent = False
     battery_monitoring_disabled = False
+    # Keeps the battery read and tares from overlapping on the scale connection
+    ble_lock = asyncio.Lock()
+
+    async def check_battery():
+        """Periodically read the battery level and send low battery alerts."""
+        nonlocal battery_level, battery_alert_sent, battery_monitoring_disabled
+        max_delay = max(battery_check_interval, BATTERY_CHECK_MAX_INTERVAL)
+        delay = battery_check_interval
+        fail_streak = 0
+        last_level = None
+        while not shutdown_event.is_set():
+            try:
+                async with ble_lock:
+                    read = asyncio.ensure_future(asyncio.to_thread(getattr, scale, "battery"))
+                    try:
+                        level = await asyncio.shield(read)
+                    except asyncio.CancelledError:
+                        # Still wait for the thread, so a disconnect after cancelling
+                        # this task never overlaps the read
+                        await asyncio.wait({read})
+                        raise
+                if level is None:
+                    # pyacaia has no battery level until its first notification after
+                    # connecting, so try again shortly rather than after a full interval
+                    await sleep_or_shutdown(interval, shutdown_event)
+                    continue
+
+                if fail_streak:
+                    # Reads are healthy again, drop the failure backoff
+                    fail_streak = 0
+                    delay = battery_check_interval
+                # Back off while the level holds steady, check at the normal rate once it
+                # moves; pyacaia reports whole percentages, so any change is a real one
+                if last_level is not None and abs(level - last_level) < 1.0:
+                    delay = min(delay * 2, max_delay)
+                else:
+                    delay = battery_check_interval
+                last_level = level
+                battery_level = level
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] Battery: {level:.1f}%")
+
+                # Check if battery is below threshold
+                if level <= battery_threshold and not battery_alert_sent:
+                    if alert_email and not disable_battery_alerts:
+                        # Sending blocks on HTTP, keep it off the event loop
+                        if await asyncio.to_thread(send_battery_alert, level, battery_threshold, alert_email, mac_address):
+                            battery_alert_sent = True
+                    else:
+                        print(f"Warning: Battery low ({level:.1f}%) but no alert email configured")
+                        battery_alert_sent = True
+
+                # Reset alert flag if battery goes above threshold + 5% (hysteresis)
+                elif level > (battery_threshold + 5.0):
+                    battery_alert_sent = False
+            except AttributeError:
+                print("Warning: scale.battery not available. Battery monitoring disabled.")
+                battery_monitoring_disabled = True
+                return
+            except Exception as e:
+                print(f"Warning: Error reading battery level: {e}")
+                # Back off while reads keep failing
+                fail_streak += 1
+                delay = min(battery_check_interval * 2**fail_streak, max_delay)
+            await sleep_or_shutdown(delay, shutdown_event)
 
     # Initialize CSV file
-    csv_file = open(log_file, 'a', newline='') # noqa: SIM115
-    csv_writer = csv.writer(csv_file)
+    # Rows are written directly rather than through csv.writer: every field is a
+    # number, an ISO timestamp or one of the fixed event names, so nothing needs
+    # quoting. Lines end in \r\n to match what csv.writer produced.
+    csv_file = open(log_file, 'a', buffering=8192, newline='') # noqa: SIM115
 
     # Write header if file is new
     if csv_file.tell() == 0:
-        csv_writer.writerow(['timestamp', 'weight_g', 'event', 'battery_pct'])
+        csv_file.write("timestamp,weight_g,event,battery_pct\r\n")
         csv_file.flush()
+    last_flush = time.monotonic()
 
     print(f"Monitoring scale (logging to {log_file})...")
     print(f"Bird weight range: {min_bird_weight}-{max_bird_weight}g")
     print("Press Ctrl+C to stop\n")
 
+    battery_task = asyncio.create_task(check_battery())
+
     try:
         while not shutdown_event.is_set():
-            # Check battery level periodically
-            current_time = time.time()
-            battery_level = None
-            if not battery_monitoring_disabled and (current_time - last_battery_check) >= battery_check_interval:
-                try:
-                    battery_level = scale.battery
-                    if battery_level is not None:
-                        last_battery_check = current_time
-                        print(f"[{datetime.now().strftime('%H:%M:%S')}] Battery: {battery_level:.1f}%")
-
-                        # Check if battery is below threshold
-                        if battery_level <= battery_threshold and not battery_alert_sent:
-                            if alert_email and not disable_battery_alerts:
-                                if send_battery_alert(battery_level, battery_threshold, alert_email, mac_address):
-                                    battery_alert_sent = True
-                            else:
-                                print(f"Warning: Battery low ({battery_level:.1f}%) but no alert email configured")
-                                battery_alert_sent = True
-
-                        # Reset alert flag if battery goes above threshold + 5% (hysteresis)
-                        elif battery_level > (battery_threshold + 5.0):
-                            battery_alert_sent = False
-                except AttributeError:
-                    if not battery_monitoring_disabled:
-                        print("Warning: scale.battery not available. Battery monitoring disabled.")
-                        battery_monitoring_disabled = True
-                except Exception as e:
-                    print(f"Warning: Error reading battery level: {e}")
-
             # Check if the scale is still connected, perhaps it was turned off?
             if not scale.connected:
                 print("\nScale disconnected, attempting to reconnect...")
 
+                # Stop battery checks, letting a read in progress finish, so nothing
+                # touches the old connection while it is torn down
+                battery_task.cancel()
+                await asyncio.gather(battery_task, return_exceptions=True)
+
                 # Try to disconnect cleanly if possible
                 with contextlib.suppress(Exception):
-                    scale.disconnect()
+                    await asyncio.to_thread(scale.disconnect)
 
                 # Retry connection with exponential backoff
                 retry_delay = 1
@@ -254,13 +355,14 @@ async def monitor_scale(scale, log_file, shutdown_event, use_simulator=False, sc
                         scale = await connect_scale(use_simulator, scenario, mac_address)
                         print("Reconnected successfully!")
                         # Reset bird state after reconnection
-                        bird_start_time = None
-                        # Reset battery check timer but keep alert state
-                        last_battery_check = 0
+                        bird_start_mono = None
+                        # Restart battery checks right away but keep alert state
+                        if not battery_monitoring_disabled:
+                            battery_task = asyncio.create_task(check_battery())
                         break
                     except Exception as e:
                         print(f"Reconnection failed: {e}. Retrying in {retry_delay}s...")
-                        await asyncio.sleep(retry_delay)
+                        await sleep_or_shutdown(retry_delay, shutdown_event)
                         retry_delay = min(retry_delay * 2, max_retry_delay)
 
                 # If we exited due to shutdown, break outer loop
@@ -271,45 +373,64 @@ async def monitor_scale(scale, log_file, shutdown_event, use_simulator=False, sc
                 await asyncio.sleep(1)
                 continue
 
+            # pyacaia updates scale.weight from its own notification thread
             weight = scale.weight or 0.0
-            timestamp = datetime.now().isoformat()
+            # A battery level read since the last reading goes on this reading's row,
+            # if it gets one, and is not carried over to later rows
+            battery = "" if battery_level is None else f"{battery_level:.1f}"
+            battery_level = None
+
+            # Read the clocks once per reading: wall time for output, monotonic for durations
+            now = datetime.now()
+            now_mono = time.monotonic()
+            timestamp = now.isoformat()
 
             # Auto-tare logic: tare if weight is non-zero but outside bird range
             if weight != 0 and (weight < min_bird_weight or weight > max_bird_weight):
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] Auto-taring (weight: {weight:.1f}g)")
-                scale.tare()
-                time.sleep(0.5)  # Give scale time to process tare
+                print(f"[{now:%H:%M:%S}] Auto-taring (weight: {weight:.1f}g)")
+                async with ble_lock:
+                    await asyncio.to_thread(scale.tare)
+                await asyncio.sleep(0.5)  # Give scale time to process tare
                 continue
 
+            in_range = min_bird_weight <= weight <= max_bird_weight
+            event = None
+
             # Detect bird landing
-            if bird_start_time is None and min_bird_weight <= weight <= max_bird_weight:
-                bird_start_time = datetime.now()
+            if bird_start_mono is None and in_range:
+                bird_start_mono = now_mono
                 event = "bird_landed"
-                print(f"[{bird_start_time.strftime('%H:%M:%S')}] Bird landed: {weight:.1f}g")
-                csv_writer.writerow([timestamp, f"{weight:.2f}", event, battery_level if battery_level is not None else ""])
-                csv_file.flush()
+                print(f"[{now:%H:%M:%S}] Bird landed: {weight:.1f}g")
 
             # Log while bird is present
-            elif bird_start_time is not None and min_bird_weight <= weight <= max_bird_weight:
+            elif bird_start_mono is not None and in_range:
                 event = "bird_present"
-                csv_writer.writerow([timestamp, f"{weight:.2f}", event, battery_level if battery_level is not None else ""])
-                csv_file.flush()
 
             # Detect bird leaving
-            elif bird_start_time is not None and weight < min_bird_weight:
-                duration = (datetime.now() - bird_start_time).total_seconds()
-                bird_start_time = None
+            elif bird_start_mono is not None and weight < min_bird_weight:
+                duration = now_mono - bird_start_mono
+                bird_start_mono = None
                 event = "bird_left"
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] Bird left (duration: {duration:.1f}s)")
-                csv_writer.writerow([timestamp, f"{weight:.2f}", event, battery_level if battery_level is not None else ""])
-                csv_file.flush()
+                print(f"[{now:%H:%M:%S}] Bird left (duration: {duration:.1f}s)")
+
+            if event:
+                csv_file.write(f"{timestamp},{weight:.2f},{event},{battery}\r\n")
+
+                # Readings during a visit are buffered and flushed periodically,
+                # landing and leaving are flushed right away
+                if event != "bird_present" or now_mono - last_flush >= CSV_FLUSH_INTERVAL:
+                    csv_file.flush()
+                    last_flush = now_mono
 
-            await asyncio.sleep(interval)
+            await sleep_or_shutdown(interval, shutdown_event)
 
     finally:
+        battery_task.cancel()
+        # Let a battery read still running in a thread finish before disconnecting
+        await asyncio.gather(battery_task, return_exceptions=True)
         print("\nMonitoring stopped")
         csv_file.close()
-        scale.disconnect()
+        await asyncio.to_thread(scale.disconnect)
 
 
 async def main():
@@ -324,7 +445,7 @@ async def main():
     parser.add_argument("--min-weight", type=float, default=20.0, help="Minimum bird weight in grams (default: 20)")
     parser.add_argument("--max-weight", type=float, default=60.0, help="Maximum bird weight in grams (default: 60)")
     parser.add_argument("--battery-threshold", type=float, default=20.0, help="Battery percentage threshold for alerts (default: 20)")
-    parser.add_argument("--battery-check-interval", type=int, default=300, help="Battery check interval in seconds (default: 300 = 5 min)")
+    parser.add_argument("--battery-check-interval", type=int, default=300, help="Base battery check interval in seconds, backed off while the level is steady or reads fail (default: 300 = 5 min)")
     parser.add_argument("--alert-email", type=str, help="Email address to receive battery alerts (overrides ALERT_EMAIL env var)")
     parser.add_argument("--disable-battery-alerts", action="store_true", help="Disable battery email alerts")
     args = parser.parse_args()
@@ -338,8 +459,8 @@ async def main():
     # Check Gmail OAuth credentials at startup if email alerts are enabled
     if alert_email and not args.disable_battery_alerts:
         print("Checking Gmail OAuth credentials for email alerts...")
-        creds = get_gmail_credentials()
-        if not creds:
+        # Loads the credentials and caches the service for later alerts
+        if not get_gmail_service():
             print("\nERROR: Gmail credentials not found.")
             print("Email alerts require OAuth authentication with Gmail.")
             print("\nTo set up email alerts:")
@@ -399,7 +520,13 @@ async def main():
 
 
 def run():
-    asyncio.run(main())
+    # Use uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
 
 
 if __name__ == "__main__":
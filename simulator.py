@@ -1,7 +1,17 @@
 from enum import Enum
+import logging
 import random
+import sys
 import time
 
+# Simulator events go through a logger so callers can quiet them with setLevel
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_handler = logging.StreamHandler(sys.stdout)
+_handler.setFormatter(logging.Formatter("[SIMULATOR] %(message)s"))
+logger.addHandler(_handler)
+
 
 class BirdState(Enum):
     """Possible states of the simulated scale."""
@@ -31,10 +41,8 @@ class MockAcaiaScale:
         self._weight = 0.0
         self._tare_offset = 0.0
         self._state = BirdState.EMPTY
-        self._state_start_time = time.time()
         self._bird_weight = None
-        self._battery_level = 100.0  # Start at 100%
-        self._battery_start_time = time.time()
+        self._battery_start_time = time.monotonic()
 
         # Bird weight parameters (typical small bird range)
         self.min_bird_weight = 25
@@ -58,20 +66,23 @@ class MockAcaiaScale:
             self.empty_duration_range = (10, 30)  # 10-30 seconds between visits
             self.junk_probability = 0.2
 
+        # Time at which the current state ends, picked once on entering it
+        self._state_deadline = time.monotonic() + random.uniform(*self.empty_duration_range)
+
     def connect(self):
         """Simulate connection to scale."""
         self.connected = True
-        print(f"[SIMULATOR] Connected to mock scale (scenario: {self.scenario})")
+        logger.info("Connected to mock scale (scenario: %s)", self.scenario)
 
     def disconnect(self):
         """Simulate disconnection from scale."""
         self.connected = False
-        print("[SIMULATOR] Disconnected from mock scale")
+        logger.info("Disconnected from mock scale")
 
     def tare(self):
         """Tare the scale (zero it)."""
         self._tare_offset = self._weight
-        print(f"[SIMULATOR] Tared scale (offset: {self._tare_offset:.1f}g)")
+        logger.info("Tared scale (offset: %.1fg)", self._tare_offset)
 
     @property
     def weight(self):
@@ -88,72 +99,62 @@ class MockAcaiaScale:
     @property
     def battery(self):
         """Get current battery level (simulated drain over time)."""
-        # Simulate battery drain: -0.1% per minute
-        elapsed_minutes = (time.time() - self._battery_start_time) / 60.0
-        self._battery_level = max(0.0, 100.0 - (elapsed_minutes * 0.1))
-        return self._battery_level
+        # Simulate battery drain from 100%: -0.1% per minute
+        elapsed_minutes = (time.monotonic() - self._battery_start_time) / 60.0
+        return max(0.0, 100.0 - (elapsed_minutes * 0.1))
 
     def _update_state(self):
-        """Update the simulated state based on elapsed time."""
-        elapsed = time.time() - self._state_start_time
+        """Update the simulated state once the current state's deadline has passed."""
+        if time.monotonic() < self._state_deadline:
+            return
 
         if self._state == BirdState.EMPTY:
-            # Check if it's time for something to appear
-            min_duration, max_duration = self.empty_duration_range
-            if elapsed > random.uniform(min_duration, max_duration):
-                # Decide what appears: bird or junk
-                if random.random() < self.junk_probability:
-                    self._transition_to_junk()
-                else:
-                    self._transition_to_bird()
-
-        elif self._state == BirdState.BIRD_PRESENT:
-            # Check if bird should leave
-            min_duration, max_duration = self.visit_duration_range
-            if elapsed > random.uniform(min_duration, max_duration):
-                self._transition_to_empty()
-
-        elif self._state == BirdState.JUNK:
-            # Junk stays for a short random time
-            if elapsed > random.uniform(2, 6):
-                self._transition_to_empty()
+            # Decide what appears: bird or junk
+            if random.random() < self.junk_probability:
+                self._transition_to_junk()
+            else:
+                self._transition_to_bird()
+        else:
+            # Bird leaves, or junk is removed
+            self._transition_to_empty()
 
     def _transition_to_bird(self):
         """Transition to bird present state."""
         self._state = BirdState.BIRD_PRESENT
-        self._state_start_time = time.time()
+        self._state_deadline = time.monotonic() + random.uniform(*self.visit_duration_range)
         # Generate a random bird weight and stick with it for this visit
         self._bird_weight = random.uniform(self.min_bird_weight, self.max_bird_weight)
         self._weight = self._bird_weight
-        print(f"[SIMULATOR] Bird landed ({self._bird_weight:.1f}g)")
+        logger.info("Bird landed (%.1fg)", self._bird_weight)
 
     def _transition_to_empty(self):
         """Transition to empty state."""
         self._state = BirdState.EMPTY
-        self._state_start_time = time.time()
+        self._state_deadline = time.monotonic() + random.uniform(*self.empty_duration_range)
         self._weight = 0
         self._bird_weight = None
-        print("[SIMULATOR] Scale empty")
+        logger.info("Scale empty")
 
     def _transition_to_junk(self):
         """Transition to junk state (something requiring tare)."""
         self._state = BirdState.JUNK
-        self._state_start_time = time.time()
+        # Junk stays for a short random time
+        self._state_deadline = time.monotonic() + random.uniform(2, 6)
 
         # Generate either too-light, too-heavy, or negative junk
         rand = random.random()
         if rand < 0.33:
             # Light junk (dust, small debris)
             self._weight = random.uniform(0.5, 15)
-            print(f"[SIMULATOR] Light junk on scale ({self._weight:.1f}g)")
+            logger.info("Light junk on scale (%.1fg)", self._weight)
         elif rand < 0.66:
             # Heavy junk (cup, bowl, hand, etc.)
             self._weight = random.uniform(70, 200)
-            print(f"[SIMULATOR] Heavy junk on scale ({self._weight:.1f}g)")
+            logger.info("Heavy junk on scale (%.1fg)", self._weight)
         else:
             # Negative weight (something removed or scale drift)
             self._weight = random.uniform(-20, -2)
-            print(f"[SIMULATOR] Negative weight on scale ({self._weight:.1f}g)")
+            logger.info("Negative weight on scale (%.1fg)", self._weight)
 
 
 def create_mock_scale(mac=None, scenario="random"):